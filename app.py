@@ -82,15 +82,18 @@ def _first_existing_col(cols: list[str], candidates: list[str]) -> str | None:
             return cols[cols_l.index(c.lower())]
     return None
 
+@st.cache_data(show_spinner=False, max_entries=8)
 def _extract_unique_style_rows(xlsx_bytes: bytes) -> pd.DataFrame | None:
     """Extract unique styles from the supplier file.
 
+    Cached on the file bytes: this runs on every Streamlit rerun (each widget change).
+
     Returns a dataframe with columns (when available) in this order:
       1) Style Name
       2) Style Number
     """
     bio = io.BytesIO(xlsx_bytes)
-    xls = pd.ExcelFile(bio)
+    xls = pd.ExcelFile(bio, engine="calamine")
 
     style_number_candidates = [
         "Style Number", "Style Num", "Style #", "style number", "style #", "Style",
@@ -1,13 +1,16 @@
+import functools
 import io
 import re
 import math
+import numpy as np
 import pandas as pd
-import openpyxl
+import streamlit as st
+import xlsxwriter
+from python_calamine import CalamineWorkbook
 from slugify import slugify
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
 
-YELLOW_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+YELLOW_FILL = {"bg_color": "#FFFF00", "pattern": 1}
+RED_FONT = {"font_color": "#FF0000"}
 
 # ---------------------------------------------------------
 # ORDRE FINAL DES COLONNES (strict)
@@ -60,32 +63,54 @@ SHOPIFY_OUTPUT_COLUMNS = [
     "Inventory Available: Le Club",
 ]
 
+# Supplier text columns: Arrow-backed strings, so .str operations run in Arrow's C++ kernels
+ARROW_STR = pd.StringDtype("pyarrow")
+
+# ---------------------------------------------------------
+# Regex (compiled once)
+# ---------------------------------------------------------
+_WS_RE = re.compile(r"\s+")
+_INT_FLOAT_RE = re.compile(r"^(\d+)\.0+$")
+_TRAILING_DOT0_RE = re.compile(r"\.0$")
+_REG_MARK_RE = re.compile(r"[\(\[\{]\s*r\s*[\)\]\}]", re.IGNORECASE)
+_TSHIRT_RE = re.compile(r"\bt\s*[- ]\s*shirt\b")
+_TEE_RE = re.compile(r"\btees?\b")
+_LONG_SLEEVE_RE = re.compile(r"\blong\s*[- ]\s*sleeve\b")
+_WORDS_RE = re.compile(r"[a-z0-9]+")
+
+
 # ---------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------
 def _norm(s) -> str:
-    return re.sub(r"\s+", " ", str(s or "").strip())
+    return _WS_RE.sub(" ", str(s or "").strip())
 
 
 
 def _clean_style_key(v) -> str:
     s = _norm(v)
     # if Excel treated numeric as float: 123.0 -> 123
-    s = re.sub(r"^(\d+)\.0+$", r"\1", s)
+    s = _INT_FLOAT_RE.sub(r"\1", s)
     return s
 
 def _strip_reg_for_handle(s: str) -> str:
     """Handle only: remove ® and (r)/[r] to keep URL safe."""
     t = _norm(s)
     t = t.replace("®", "")
-    t = re.sub(r"[\(\[\{]\s*r\s*[\)\]\}]", "", t, flags=re.IGNORECASE)
+    t = _REG_MARK_RE.sub("", t)
     return _norm(t)
 
 
+@functools.lru_cache(maxsize=4096)
+def _slug(text: str) -> str:
+    """slugify, memoized: catalogs repeat the same description/color combinations."""
+    return slugify(text)
+
+
 def _convert_r_to_registered(s: str) -> str:
     """Display/SEO: convert (r)/[r] to ®."""
     t = _norm(s)
-    t = re.sub(r"[\(\[\{]\s*r\s*[\)\]\}]", "®", t, flags=re.IGNORECASE)
+    t = _REG_MARK_RE.sub("®", t)
     return t
 
 
@@ -135,18 +160,14 @@ def _normalize_match_text(s: str) -> str:
     t = t.replace("®", "")
     t = t.lower()
 
-    t = re.sub(r"\bt\s*[- ]\s*shirt\b", "tshirt", t)
-    t = re.sub(r"\btshirt\b", "tshirt", t)
-
-    t = re.sub(r"\btee\b", "tshirt", t)
-    t = re.sub(r"\btees\b", "tshirt", t)
-
-    t = re.sub(r"\blong\s*[- ]\s*sleeve\b", "long sleeve", t)
+    t = _TSHIRT_RE.sub("tshirt", t)
+    t = _TEE_RE.sub("tshirt", t)
+    t = _LONG_SLEEVE_RE.sub("long sleeve", t)
     return t
 
 
 def _words(s: str) -> list[str]:
-    return re.findall(r"[a-z0-9]+", _normalize_match_text(s))
+    return _WORDS_RE.findall(_normalize_match_text(s))
 
 
 def _singularize_token(tok: str) -> str:
@@ -155,8 +176,10 @@ def _singularize_token(tok: str) -> str:
     return tok
 
 
-def _wordset_loose(s: str) -> set[str]:
-    return set(_singularize_token(t) for t in _words(s))
+@functools.lru_cache(maxsize=4096)
+def _wordset_loose(s: str) -> frozenset[str]:
+    # memoized: descriptions repeat across sizes/colors and are matched several times
+    return frozenset(_singularize_token(t) for t in _words(s))
 
 
 def _first_existing_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
@@ -168,26 +191,47 @@ def _first_existing_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
 
 
 # ---------------------------------------------------------
-# Help data readers (openpyxl)
+# Help data readers (calamine: whole workbook parsed once)
 # ---------------------------------------------------------
-def _load_help_wb(help_bytes: bytes):
-    return openpyxl.load_workbook(io.BytesIO(help_bytes), data_only=True)
+def _help_cell(v):
+    """Calamine -> openpyxl-like values: empty cell -> None, 150.0 -> 150."""
+    if v == "":
+        return None
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def _load_help_wb(help_bytes: bytes) -> dict[str, list[list]]:
+    """{sheet name: rows} for every sheet, from a single open/decompress of the file."""
+    wb = CalamineWorkbook.from_filelike(io.BytesIO(help_bytes))
+    sheets = {}
+    for name in wb.sheet_names:
+        rows = wb.get_sheet_by_name(name).to_python(skip_empty_area=False)
+        sheets[name] = [[_help_cell(v) for v in row] for row in rows]
+    wb.close()
+    return sheets
+
+
+def _row_value(row: list, idx: int):
+    """0-based cell value; None past the sheet width."""
+    return row[idx] if idx < len(row) else None
 
 
 def _read_2col_map(wb, sheet_candidates: list[str]) -> dict[str, str]:
     """Col A raw -> Col B standard"""
     sheet = None
     for name in sheet_candidates:
-        if name in wb.sheetnames:
+        if name in wb:
             sheet = wb[name]
             break
     if sheet is None:
         return {}
 
     m: dict[str, str] = {}
-    for r in range(2, sheet.max_row + 1):
-        a = sheet.cell(row=r, column=1).value
-        b = sheet.cell(row=r, column=2).value
+    for row in sheet[1:]:
+        a = _row_value(row, 0)
+        b = _row_value(row, 1)
         if a is None or b is None:
             continue
         ra = str(a).strip()
@@ -198,20 +242,24 @@ def _read_2col_map(wb, sheet_candidates: list[str]) -> dict[str, str]:
     return m
 
 
-def _standardize(val: str, mapping: dict[str, str]) -> str:
-    s = _norm(val)
-    if not s or s.lower() == "nan":
-        return ""
-    return mapping.get(s.lower(), s)
+def _standardize_col(col: pd.Series, mapping: dict[str, str]) -> pd.Series:
+    """
+    Raw value -> standard value (Col B) via the lowercase-keyed help map; unknown values are kept
+    (normalized), empty / "nan" -> "". One Series.map lookup for the whole column.
+    """
+    s = col.fillna("").astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
+    key = s.str.lower()
+    s = s.mask(key.eq("nan"), "")
+    return key.map(mapping).fillna(s)
 
 
 def _read_list_column(wb, sheet_name: str) -> list[str]:
-    if sheet_name not in wb.sheetnames:
+    if sheet_name not in wb:
         return []
     ws = wb[sheet_name]
     out = []
-    for r in range(2, ws.max_row + 1):
-        v = ws.cell(row=r, column=1).value
+    for row in ws[1:]:
+        v = _row_value(row, 0)
         if v is None:
             continue
         s = str(v).strip()
@@ -226,13 +274,13 @@ def _read_variant_weight_map(wb, sheet_name: str = "Variant Weight (Grams)") ->
     Map Custom Product Type -> Variant Weight (Grams)
     from Help Data sheet "Variant Weight (Grams)".
     """
-    if sheet_name not in wb.sheetnames:
+    if sheet_name not in wb:
         return {}
     ws = wb[sheet_name]
     m: dict[str, str] = {}
-    for r in range(2, ws.max_row + 1):
-        k = ws.cell(row=r, column=1).value
-        v = ws.cell(row=r, column=2).value
+    for row in ws[1:]:
+        k = _row_value(row, 0)
+        v = _row_value(row, 1)
         if k is None or v is None:
             continue
         ks = str(k).strip()
@@ -250,13 +298,14 @@ def _read_variant_weight_map(wb, sheet_name: str = "Variant Weight (Grams)") ->
 
 def _read_category_rows(wb, sheet_name: str):
     """returns list[(name_keywords, id)] from columns A,B. Handles sheets with or without headers."""
-    if sheet_name not in wb.sheetnames:
+    if sheet_name not in wb:
         return None
     ws = wb[sheet_name]
 
     # Detect header row (light heuristic)
-    a1 = ws.cell(row=1, column=1).value
-    b1 = ws.cell(row=1, column=2).value
+    first = ws[0] if ws else []
+    a1 = _row_value(first, 0)
+    b1 = _row_value(first, 1)
     start_row = 1
     if isinstance(a1, str) and a1.strip().lower() in {"name", "keyword", "category", "product category"}:
         start_row = 2
@@ -264,9 +313,9 @@ def _read_category_rows(wb, sheet_name: str):
         start_row = 2
 
     rows = []
-    for r in range(start_row, ws.max_row + 1):
-        a = ws.cell(row=r, column=1).value
-        b = ws.cell(row=r, column=2).value
+    for row in ws[start_row - 1:]:
+        a = _row_value(row, 0)
+        b = _row_value(row, 1)
         if a is None:
             continue
         aa = str(a).strip()
@@ -278,12 +327,12 @@ def _read_category_rows(wb, sheet_name: str):
 
 def _read_brand_line_map(wb, sheet_name: str) -> dict[str, str]:
     """Col A = brand, Col B+ concatenated text parts"""
-    if sheet_name not in wb.sheetnames:
+    if sheet_name not in wb:
         return {}
     ws = wb[sheet_name]
     m = {}
-    for r in range(2, ws.max_row + 1):
-        brand = ws.cell(row=r, column=1).value
+    for row in ws[1:]:
+        brand = _row_value(row, 0)
         if brand is None:
             continue
         b = str(brand).strip()
@@ -291,8 +340,7 @@ def _read_brand_line_map(wb, sheet_name: str) -> dict[str, str]:
             continue
 
         parts = []
-        for c in range(2, ws.max_column + 1):
-            v = ws.cell(row=r, column=c).value
+        for v in row[1:]:
             if v is None:
                 continue
             s = str(v).strip()
@@ -307,26 +355,26 @@ def _read_brand_line_map(wb, sheet_name: str) -> dict[str, str]:
 
 def _read_size_reco_map(wb) -> dict[str, str]:
     """Garment -> Comment"""
-    if "Size Recommandation" not in wb.sheetnames:
+    if "Size Recommandation" not in wb:
         return {}
     ws = wb["Size Recommandation"]
 
     headers = {}
-    for c in range(1, ws.max_column + 1):
-        h = ws.cell(row=1, column=c).value
+    first = ws[0] if ws else []
+    for c, h in enumerate(first):
         if h is None:
             continue
         headers[str(h).strip().lower()] = c
 
     gcol = headers.get("garment")
     ccol = headers.get("comment")
-    if not gcol or not ccol:
+    if gcol is None or ccol is None:
         return {}
 
     m = {}
-    for r in range(2, ws.max_row + 1):
-        g = ws.cell(row=r, column=gcol).value
-        c = ws.cell(row=r, column=ccol).value
+    for row in ws[1:]:
+        g = _row_value(row, gcol)
+        c = _row_value(row, ccol)
         if g is None or c is None:
             continue
         gs = str(g).strip()
@@ -339,106 +387,85 @@ def _read_size_reco_map(wb) -> dict[str, str]:
 # ---------------------------------------------------------
 # Matching functions
 # ---------------------------------------------------------
-def _best_match_id(text: str, cat_rows) -> str:
+def _build_keyword_index(entries):
+    """
+    [(keywords, value)] -> (entries as (loose word set, value), inverted index word -> entry positions).
+    Built once per run: a lookup only visits entries sharing at least one word with the text.
+    """
+    sets = []
+    index: dict[str, list[int]] = {}
+    for i, (name, value) in enumerate(entries):
+        nset = _wordset_loose(name)
+        sets.append((nset, value))
+        for w in nset:
+            index.setdefault(w, []).append(i)
+    return sets, index
+
+
+def _best_keyword_match(tset: set[str], kw_index):
+    """Value of the largest keyword set fully contained in tset (first entry wins ties), else None."""
+    sets, index = kw_index
+    best_i = -1
+    best_len = 0
+    for i in {i for w in tset for i in index.get(w, ())}:
+        nset = sets[i][0]
+        if (len(nset) > best_len or (len(nset) == best_len and i < best_i)) and nset <= tset:
+            best_len = len(nset)
+            best_i = i
+    return sets[best_i][1] if best_i >= 0 else None
+
+
+def _best_match_id(words: frozenset[str], cat_index) -> str:
     """
     Exact-match (loose singular/plural): all words in name must be in text.
+    `words` is the text's _wordset_loose, computed once by the caller.
     Returns ID (col B).
 
     Special rule:
     - If text contains "long sleeve" but no specific garment match is found,
       ALWAYS try "long sleeve jersey" (never tshirt).
     """
-    if not cat_rows:
+    if not cat_index:
         return ""
 
-    def _match(t: str) -> str:
-        tset = _wordset_loose(t)
-        best_id = ""
-        best_len = 0
-        for name, cid in cat_rows:
-            nset = _wordset_loose(name)
-            if nset and nset.issubset(tset):
-                if len(nset) > best_len:
-                    best_len = len(nset)
-                    best_id = str(cid or "").strip()
-        best_id = re.sub(r"\.0$", "", best_id) if best_id else ""
-        return best_id
+    def _match(w: frozenset[str]) -> str:
+        best_id = str(_best_keyword_match(w, cat_index) or "").strip()
+        return _TRAILING_DOT0_RE.sub("", best_id) if best_id else ""
 
     # 1) normal match
-    got = _match(text)
+    got = _match(words)
     if got:
         return got
 
     # 2) LONG SLEEVE fallback -> ALWAYS Jersey
-    w = _wordset_loose(text)
-    if {"long", "sleeve"}.issubset(w):
-        got = _match(f"{text} jersey")
-        if got:
-            return got
-
-    return ""
-
-    def _match(t: str) -> str:
-        tset = _wordset_loose(t)
-        best_id = ""
-        best_len = 0
-        for name, cid in cat_rows:
-            nset = _wordset_loose(name)
-            if nset and nset.issubset(tset):
-                if len(nset) > best_len:
-                    best_len = len(nset)
-                    best_id = str(cid or "").strip()
-        best_id = re.sub(r"\.0$", "", best_id) if best_id else ""
-        return best_id
-
-    # 1) normal match
-    got = _match(text)
-    if got:
-        return got
-
-    # 2) LONG SLEEVE fallback: if only "long sleeve" appears, we try common garment types
-    w = _wordset_loose(text)
-    if {"long", "sleeve"}.issubset(w):
-        # Prefer T-Shirt when no further hint is present
-        got = _match(f"{text} tshirt")
-        if got:
-            return got
-        got = _match(f"{text} jersey")
+    if {"long", "sleeve"}.issubset(words):
+        got = _match(words | {"jersey"})
         if got:
             return got
 
     return ""
 
 
-def _best_match_product_type(text: str, product_types: list[str]) -> str:
+def _best_match_product_type(words: frozenset[str], pt_index) -> str:
     """
     Match product type by word-subset (loose singular/plural).
+    `words` is the text's _wordset_loose, computed once by the caller.
 
     Special rule:
     - If text contains "long sleeve" but no specific garment match is found,
       ALWAYS try "long sleeve jersey" (never tshirt).
     """
-    def _match(t: str) -> str:
-        tset = _wordset_loose(t)
-        best = ""
-        best_len = 0
-        for pt in product_types:
-            pset = _wordset_loose(pt)
-            if pset and pset.issubset(tset):
-                if len(pset) > best_len:
-                    best_len = len(pset)
-                    best = pt
-        return best
+    def _match(w: frozenset[str]) -> str:
+        return _best_keyword_match(w, pt_index) or ""
 
     # 1) normal match
-    got = _match(text)
+    got = _match(words)
     if got:
         return got
 
     # 2) LONG SLEEVE fallback -> ALWAYS Jersey
-    w = _wordset_loose(text)
-    if {"long", "sleeve"}.issubset(w):
-        got = _match(f"{text} jersey")
+    if {"long", "sleeve"}.issubset(words):
+        got = _match(words | {"jersey"})
         if got:
             return got
 
@@ -448,75 +475,193 @@ def _best_match_product_type(text: str, product_types: list[str]) -> str:
 # ---------------------------------------------------------
 # Parsing & formatting
 # ---------------------------------------------------------
-def _extract_color_size_from_description(desc: str) -> tuple[str, str]:
-    text = _norm(desc)
-    if not text:
-        return "", ""
-    parts = re.split(r"\s*[-,/]\s*|\s*,\s*", text)
-    parts = [p.strip() for p in parts if p and p.strip()]
-    if len(parts) < 2:
-        return "", ""
-    last = parts[-1]
-    if re.fullmatch(r"(X{0,3}S|X{0,3}L|S|M|L|XL|XXL|XXXL|\d{1,2}([./-]\d{1,2})?)", last, flags=re.IGNORECASE):
-        return parts[-2], last
-    return parts[-1], ""
-
-
-def _round_to_nearest_9_99(price) -> float:
-    if price is None or (isinstance(price, float) and math.isnan(price)):
-        return float("nan")
-    p = float(price)
-    nearest10 = math.floor(p / 10.0 + 0.5) * 10.0
-    return round(nearest10 - 0.01, 2)
-
-
-def _barcode_keep_zeros(x) -> str:
-    if x is None:
-        return ""
-    s = str(x).strip()
-    if s == "" or s.lower() == "nan":
-        return ""
-    if re.fullmatch(r"\d+\.0", s):
-        s = s[:-2]
-    if re.fullmatch(r"\d+", s):
-        return s.zfill(12) if len(s) <= 12 else s
-    return s
+def _extract_color_size_from_description(desc: pd.Series) -> pd.DataFrame:
+    """
+    Fallback Color/Size from the last two "-", "," or "/" separated parts of
+    the (normalized) description:
+    - last part looks like a size -> (part before last, last part)
+    - otherwise                   -> (last part, "")
+    - fewer than 2 parts          -> ("", "")
+    """
+    part = r"[^-,/\s](?:[^-,/]*[^-,/\s])?"
+    tail = desc.astype(ARROW_STR).str.extract(
+        rf"^(?:.*[-,/])?\s*(?P<prev>{part})[\s,/-]*[-,/][\s,/-]*(?P<last>{part})[\s,/-]*$"
+    ).fillna("")
+    is_size = tail["last"].str.fullmatch(
+        r"(X{0,3}S|X{0,3}L|S|M|L|XL|XXL|XXXL|\d{1,2}([./-]\d{1,2})?)", case=False
+    )
+    return pd.DataFrame(
+        {
+            "color": tail["prev"].where(is_size, tail["last"]).astype(object),
+            "size": tail["last"].where(is_size, "").astype(object),
+        },
+        index=desc.index,
+    )
 
 
-def _hs_code_clean(x) -> str:
-    if x is None:
-        return ""
-    s = str(x).strip()
-    if s == "" or s.lower() == "nan":
-        return ""
-    return re.sub(r"\.0$", "", s)
+def _barcode_keep_zeros_series(col: pd.Series) -> pd.Series:
+    """
+    UPC -> barcode text: "123.0" -> "123", all-digit codes zero-padded to 12, missing -> "".
+    """
+    s = col.astype(ARROW_STR).str.strip().fillna("")
+    s = s.mask(s.str.lower().eq("nan"), "")
+    s = s.str.replace(r"^(\d+)\.0$", r"\1", regex=True)
+    short_digits = s.str.fullmatch(r"\d+") & s.str.len().le(12)
+    return s.mask(short_digits, s.str.zfill(12)).astype(object)
+
+
+def _hs_code_clean_series(col: pd.Series) -> pd.Series:
+    s = col.astype(ARROW_STR).str.strip().fillna("")
+    s = s.mask(s.str.lower().eq("nan"), "")
+    return s.str.replace(r"\.0$", "", regex=True).astype(object)
+
+
+def _clean_id_series(col: pd.Series) -> pd.Series:
+    """SKU / External ID: normalized spaces, "123.0" -> "123", missing -> ""."""
+    # object dtype on purpose: Python's \s (like _norm) also matches NBSP, Arrow's regex does not
+    s = col.astype(object).where(col.notna(), "")
+    s = s.str.replace(r"\s+", " ", regex=True).str.strip()
+    return s.str.replace(r"\.0$", "", regex=True)
 
 
 # ---------------------------------------------------------
-# Excel highlighting
+# Excel output (xlsxwriter, constant_memory)
 # ---------------------------------------------------------
-def _apply_yellow_for_empty(buffer: io.BytesIO, sheet_name: str, cols_to_yellow: list[str]) -> io.BytesIO:
-    buffer.seek(0)
-    wb = load_workbook(buffer)
-    ws = wb[sheet_name]
+def _empty_cells_mask(df: pd.DataFrame, cols_to_yellow: list[str]) -> np.ndarray:
+    """(rows, columns) bool array: True on empty cells of the given columns."""
+    mask = np.zeros(df.shape, dtype=bool)
+    for col_name in cols_to_yellow:
+        if col_name not in df.columns:
+            continue
+        col = df[col_name]
+        mask[:, df.columns.get_loc(col_name)] = (col.isna() | col.astype(str).str.strip().eq("")).to_numpy()
+    return mask
 
-    header = [cell.value for cell in ws[1]]
-    col_index = {name: i + 1 for i, name in enumerate(header) if name}
 
-    for col_name in cols_to_yellow:
-        if col_name not in col_index:
+def _write_sheet(wb: xlsxwriter.Workbook, sheet_name: str, df: pd.DataFrame, cell_formats: np.ndarray | None = None) -> None:
+    """
+    Header + data rows, strictly top to bottom.
+    constant_memory flushes each row once the next one starts, so pandas' to_excel
+    (which writes column by column) can't be used.
+    cell_formats: optional (rows, columns) array of xlsxwriter formats (None = no format).
+    """
+    ws = wb.add_worksheet(sheet_name)
+    ws.write_row(0, 0, [str(c) for c in df.columns])
+
+    values = df.astype(object).where(df.notna(), None)
+    # Data rows start at Excel row 2 (0-based row 1)
+    for r, row in enumerate(values.itertuples(index=False, name=None)):
+        fmts = cell_formats[r] if cell_formats is not None else None
+        for c, v in enumerate(row):
+            fmt = fmts[c] if fmts is not None else None
+            if v is None:
+                ws.write_blank(r + 1, c, None, fmt)
+            else:
+                ws.write(r + 1, c, v, fmt)
+
+
+# ---------------------------------------------------------
+# Supplier reader (multi-sheet capable)
+# ---------------------------------------------------------
+@st.cache_data(show_spinner=False, max_entries=8)
+def _read_supplier_multi_sheet(xlsx_bytes: bytes) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Reads supplier XLSX.
+    - If there are multiple sheets, keep only sheets that contain the minimum required columns
+      (Description-like + MSRP-like), then concatenate.
+    - If there is a single valid sheet, behaves like the previous implementation.
+
+    Returns (rows, sheet warnings). Cached on the file bytes: re-generating with the
+    same upload skips the xlsx parse.
+    """
+    # All sheets from a single open/decompress of the file (calamine: Rust parser, much faster than openpyxl)
+    sheets = pd.read_excel(io.BytesIO(xlsx_bytes), sheet_name=None, dtype=str, engine="calamine")
+
+    # Column candidates duplicated from the main logic (kept local to avoid refactors).
+    desc_candidates = [
+        "description", "Description", "Product Name", "product name",
+        "Title", "title", "Style", "style", "Style Name", "style name",
+        "Display Name", "display name", "Online Display Name", "online display name",
+    ]
+    msrp_candidates = [
+        "Cad MSRP", "MSRP", "Retail Price (CAD)", "retail price (CAD)", "retail price (cad)",
+    ]
+
+    warnings: list[dict] = []
+    dfs: list[pd.DataFrame] = []
+    for sn, df in sheets.items():
+        # Drop fully empty rows early
+        if df is None or df.empty:
+            warnings.append({
+                "type": "sheet_skipped",
+                "sheet": sn,
+                "reason": "empty",
+            })
             continue
-        c = col_index[col_name]
-        for r in range(2, ws.max_row + 1):
-            cell = ws.cell(row=r, column=c)
-            val = cell.value
-            if val is None or (isinstance(val, str) and val.strip() == ""):
-                cell.fill = YELLOW_FILL
-
-    out = io.BytesIO()
-    wb.save(out)
-    out.seek(0)
-    return out
+        df = df.dropna(how="all")
+        if df.empty:
+            warnings.append({
+                "type": "sheet_skipped",
+                "sheet": sn,
+                "reason": "empty",
+            })
+            continue
+
+        # Validate minimum required columns
+        has_desc = _first_existing_col(df, desc_candidates) is not None
+        has_msrp = _first_existing_col(df, msrp_candidates) is not None
+        if not (has_desc and has_msrp):
+            warnings.append({
+                "type": "sheet_skipped",
+                "sheet": sn,
+                "reason": "missing_required_columns",
+                "has_desc": has_desc,
+                "has_msrp": has_msrp,
+            })
+            continue
+
+        df["_source_sheet"] = sn
+        dfs.append(df)
+
+    if not dfs:
+        raise ValueError(
+            "Aucun onglet valide détecté dans le fichier fournisseur (colonne Description + MSRP requises)."
+        )
+    return pd.concat(dfs, ignore_index=True, sort=False).astype(ARROW_STR), warnings
+
+
+# ---------------------------------------------------------
+# Help data (parsed once per help file)
+# ---------------------------------------------------------
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_all_help(help_bytes: bytes) -> dict:
+    """
+    All help-data maps and keyword indexes.
+    Cached on the file bytes: regenerating with the same help file skips parsing entirely.
+    """
+    wb = _load_help_wb(help_bytes)
+
+    shopify_cat_rows = _read_category_rows(wb, "Shopify Product Category")
+    google_cat_rows = _read_category_rows(wb, "Google Product Category")
+    product_types = _read_list_column(wb, "Product Types")
+
+    return {
+        # Standardization
+        "color": _read_2col_map(wb, ["Color Standardization", "Color Variable"]),
+        "size": _read_2col_map(wb, ["Size Standardization", "Size Variante"]),
+        "country": _read_2col_map(wb, ["Country Abbreviations", "Country of Origin"]),
+        "gender": _read_2col_map(wb, ["Gender Standardization", "Gender"]),
+        # Categories & Product types
+        "shopify_cat": _build_keyword_index(shopify_cat_rows) if shopify_cat_rows else None,
+        "google_cat": _build_keyword_index(google_cat_rows) if google_cat_rows else None,
+        "product_type": _build_keyword_index([(pt, pt) for pt in product_types]),
+        "variant_weight": _read_variant_weight_map(wb),
+        # Brand maps
+        "brand_desc": _read_brand_line_map(wb, "SEO Description Brand Part"),
+        "brand_lines": _read_brand_line_map(wb, "Brand lines"),
+        # Size reco
+        "size_comment": _read_size_reco_map(wb),
+    }
 
 
 # ---------------------------------------------------------
@@ -535,95 +680,29 @@ def run_transform(
     style_season_map = style_season_map or {}
     style_season_map = { _clean_style_key(k): v for k, v in style_season_map.items() }
 
-    # -----------------------------------------------------
-    # Supplier reader (multi-sheet capable)
-    # -----------------------------------------------------
-    def _read_supplier_multi_sheet(xlsx_bytes: bytes) -> pd.DataFrame:
-        """
-        Reads supplier XLSX.
-        - If there are multiple sheets, keep only sheets that contain the minimum required columns
-          (Description-like + MSRP-like), then concatenate.
-        - If there is a single valid sheet, behaves like the previous implementation.
-        """
-        bio = io.BytesIO(xlsx_bytes)
-        xls = pd.ExcelFile(bio)
-
-        # Column candidates duplicated from the main logic (kept local to avoid refactors).
-        desc_candidates = [
-            "description", "Description", "Product Name", "product name",
-            "Title", "title", "Style", "style", "Style Name", "style name",
-            "Display Name", "display name", "Online Display Name", "online display name",
-        ]
-        msrp_candidates = [
-            "Cad MSRP", "MSRP", "Retail Price (CAD)", "retail price (CAD)", "retail price (cad)",
-        ]
-
-        dfs: list[pd.DataFrame] = []
-        for sn in xls.sheet_names:
-            df = pd.read_excel(io.BytesIO(xlsx_bytes), sheet_name=sn, dtype=str)
-
-            # Drop fully empty rows early
-            if df is None or df.empty:
-                warnings.append({
-                    "type": "sheet_skipped",
-                    "sheet": sn,
-                    "reason": "empty",
-                })
-                continue
-            df = df.dropna(how="all")
-            if df.empty:
-                warnings.append({
-                    "type": "sheet_skipped",
-                    "sheet": sn,
-                    "reason": "empty",
-                })
-                continue
-
-            # Validate minimum required columns
-            has_desc = _first_existing_col(df, desc_candidates) is not None
-            has_msrp = _first_existing_col(df, msrp_candidates) is not None
-            if not (has_desc and has_msrp):
-                warnings.append({
-                    "type": "sheet_skipped",
-                    "sheet": sn,
-                    "reason": "missing_required_columns",
-                    "has_desc": has_desc,
-                    "has_msrp": has_msrp,
-                })
-                continue
+    sup, sheet_warnings = _read_supplier_multi_sheet(supplier_xlsx_bytes)
+    warnings.extend(sheet_warnings)
 
-            df["_source_sheet"] = sn
-            dfs.append(df)
-
-        if not dfs:
-            raise ValueError(
-                "Aucun onglet valide détecté dans le fichier fournisseur (colonne Description + MSRP requises)."
-            )
-        return pd.concat(dfs, ignore_index=True, sort=False)
-
-    sup = _read_supplier_multi_sheet(supplier_xlsx_bytes).copy()
-
-    wb = _load_help_wb(help_xlsx_bytes)
+    help_data = _build_all_help(help_xlsx_bytes)
 
     # Standardization
-    color_map = _read_2col_map(wb, ["Color Standardization", "Color Variable"])
-    size_map = _read_2col_map(wb, ["Size Standardization", "Size Variante"])
-    country_map = _read_2col_map(wb, ["Country Abbreviations", "Country of Origin"])
-    gender_map = _read_2col_map(wb, ["Gender Standardization", "Gender"])
+    color_map = help_data["color"]
+    size_map = help_data["size"]
+    country_map = help_data["country"]
+    gender_map = help_data["gender"]
 
     # Categories & Product types
-    shopify_cat_rows = _read_category_rows(wb, "Shopify Product Category")
-    google_cat_rows = _read_category_rows(wb, "Google Product Category")
-    product_types = _read_list_column(wb, "Product Types")
-    variant_weight_map = _read_variant_weight_map(wb)
-
+    shopify_cat_index = help_data["shopify_cat"]
+    google_cat_index = help_data["google_cat"]
+    product_type_index = help_data["product_type"]
+    variant_weight_map = help_data["variant_weight"]
 
     # Brand maps
-    brand_desc_map = _read_brand_line_map(wb, "SEO Description Brand Part")
-    brand_lines_map = _read_brand_line_map(wb, "Brand lines")
+    brand_desc_map = help_data["brand_desc"]
+    brand_lines_map = help_data["brand_lines"]
 
     # Size reco
-    size_comment_map = _read_size_reco_map(wb)
+    size_comment_map = help_data["size_comment"]
 
     # Supplier columns
     desc_col = _first_existing_col(
@@ -658,26 +737,15 @@ def run_transform(
     # -----------------------------------------------------
     # De-duplicate across sheets (SKU and/or UPC)
     # -----------------------------------------------------
-    def _clean_sku(x) -> str:
-        s = _norm(x)
-        return re.sub(r"\.0$", "", s)
-
-    def _make_dedupe_key(r) -> str:
-        sku = _clean_sku(r.get(extid_col, "")) if extid_col else ""
-        if not sku:
-            sku = _clean_sku(r.get(product_col, "")) if product_col else ""
-        upc = _barcode_keep_zeros(r.get(upc_col, "")) if upc_col else ""
-
-        if sku and upc:
-            return f"{sku}|{upc}"
-        if sku:
-            return sku
-        if upc:
-            return upc
-        # Fallback (rare): keep row unique if neither exists
-        return ""
+    # Key: "SKU|UPC", "SKU" or "UPC" (SKU = External ID, else Product code).
+    # Fallback (rare): empty key keeps the row unique if neither exists.
+    no_id = pd.Series("", index=sup.index, dtype=object)
+    sku = _clean_id_series(sup[extid_col]) if extid_col else no_id
+    if product_col:
+        sku = sku.mask(sku.eq(""), _clean_id_series(sup[product_col]))
+    upc = _barcode_keep_zeros_series(sup[upc_col]) if upc_col else no_id
 
-    sup["_dedupe_key"] = sup.apply(_make_dedupe_key, axis=1)
+    sup["_dedupe_key"] = (sku + "|" + upc).where(sku.ne("") & upc.ne(""), sku + upc)
 
     before = len(sup)
     # Only dedupe rows where we have at least one identifier; keep all others.
@@ -696,18 +764,20 @@ def run_transform(
         })
 
     # Base description
-    sup["_desc_raw"] = sup[desc_col].astype(str).fillna("").map(_norm)
+    sup["_desc_raw"] = sup[desc_col].fillna("").astype(str).map(_norm)
+    # Description word sets, shared by product type and both category matchers
+    desc_words = [_wordset_loose(d) for d in sup["_desc_raw"].to_numpy()]
     sup["_desc_seo"] = sup["_desc_raw"].apply(_convert_r_to_registered)
     sup["_desc_handle"] = sup["_desc_raw"].apply(_strip_reg_for_handle)
 
     # Color / Size input
-    sup["_color_raw"] = sup[color_col].astype(str).fillna("").map(_norm) if color_col else ""
-    sup["_size_raw"] = sup[size_col].astype(str).fillna("").map(_norm) if size_col else ""
+    sup["_color_raw"] = sup[color_col].fillna("").astype(str).map(_norm) if color_col else ""
+    sup["_size_raw"] = sup[size_col].fillna("").astype(str).map(_norm) if size_col else ""
 
     # Fallback parse from description if missing
-    parsed = sup["_desc_raw"].apply(_extract_color_size_from_description)
-    sup["_color_fb"] = parsed.map(lambda t: t[0])
-    sup["_size_fb"] = parsed.map(lambda t: t[1])
+    parsed = _extract_color_size_from_description(sup["_desc_raw"])
+    sup["_color_fb"] = parsed["color"]
+    sup["_size_fb"] = parsed["size"]
 
     sup["_color_in"] = sup["_color_raw"]
     sup.loc[sup["_color_in"].eq(""), "_color_in"] = sup["_color_fb"]
@@ -716,12 +786,12 @@ def run_transform(
     sup.loc[sup["_size_in"].eq(""), "_size_in"] = sup["_size_fb"]
 
     # Standardize
-    sup["_color_std"] = sup["_color_in"].apply(lambda x: _standardize(x, color_map))
-    sup["_size_std"] = sup["_size_in"].apply(lambda x: _standardize(x, size_map))
+    sup["_color_std"] = _standardize_col(sup["_color_in"], color_map)
+    sup["_size_std"] = _standardize_col(sup["_size_in"], size_map)
 
     # Gender (standardize if possible)
-    sup["_gender_raw"] = sup[gender_col].astype(str).fillna("").map(_norm) if gender_col else ""
-    sup["_gender_std"] = sup["_gender_raw"].apply(lambda x: _standardize(x, gender_map)) if gender_map else sup["_gender_raw"]
+    sup["_gender_raw"] = sup[gender_col].fillna("").astype(str).map(_norm) if gender_col else ""
+    sup["_gender_std"] = _standardize_col(sup["_gender_raw"], gender_map) if gender_map else sup["_gender_raw"]
 
     # Vendor / Brand
     sup["_vendor"] = vendor_name
@@ -734,9 +804,9 @@ def run_transform(
             gg = f"{gg}'s"
         return _title_case_preserve_registered(gg)
 
-    sup["_gender_title"] = sup["_gender_std"].astype(str).fillna("").map(_gender_for_title)
-    sup["_desc_title"] = sup["_desc_seo"].astype(str).fillna("").map(_title_case_preserve_registered)
-    sup["_color_title"] = sup["_color_in"].astype(str).fillna("").map(_title_case_preserve_registered)
+    sup["_gender_title"] = sup["_gender_std"].fillna("").astype(str).map(_gender_for_title)
+    sup["_desc_title"] = sup["_desc_seo"].fillna("").astype(str).map(_title_case_preserve_registered)
+    sup["_color_title"] = sup["_color_in"].fillna("").astype(str).map(_title_case_preserve_registered)
 
     sup["_title"] = (sup["_gender_title"].str.strip() + " " + sup["_desc_title"].str.strip()).str.strip()
     sup.loc[sup["_color_title"].str.strip().ne(""), "_title"] = (
@@ -744,20 +814,17 @@ def run_transform(
     )
 
     # Handle: Vendor + Gender + Description + Color (color NON-standardized)
-    def _make_handle(r):
-        parts = [
-            _strip_reg_for_handle(r["_vendor"]),
-            _strip_reg_for_handle(r["_gender_std"]),
-            r["_desc_handle"],
-            _strip_reg_for_handle(r["_color_in"]),
-        ]
-        parts = [p for p in parts if p and str(p).strip()]
-        return slugify(" ".join(parts))
-
-    sup["_handle"] = sup.apply(_make_handle, axis=1)
+    # (empty parts only add spaces, which slugify collapses)
+    handle_src = (
+        _strip_reg_for_handle(vendor_name)
+        + " " + sup["_gender_std"].map(_strip_reg_for_handle)
+        + " " + sup["_desc_handle"]
+        + " " + sup["_color_in"].map(_strip_reg_for_handle)
+    )
+    sup["_handle"] = [_slug(t) for t in handle_src.to_numpy()]
 
     # Custom Product Type: match using DESCRIPTION (to catch TEE / LONG SLEEVE etc.)
-    sup["_product_type"] = sup["_desc_raw"].apply(lambda t: _best_match_product_type(t, product_types))
+    sup["_product_type"] = [_best_match_product_type(w, product_type_index) for w in desc_words]
 
     # Tags (keep standardized color/gender tags)
     # -----------------------------------------------------
@@ -767,9 +834,9 @@ def run_transform(
     style_name_col = _first_existing_col(sup, ["Style Name", "style name", "Product Name", "Name"])
     sup["_seasonality_key"] = ""
     if style_num_col is not None:
-        sup["_seasonality_key"] = sup[style_num_col].astype(str).fillna("").map(_clean_style_key)
+        sup["_seasonality_key"] = sup[style_num_col].fillna("").astype(str).map(_clean_style_key)
     elif style_name_col is not None:
-        sup["_seasonality_key"] = sup[style_name_col].astype(str).fillna("").map(_clean_style_key)
+        sup["_seasonality_key"] = sup[style_name_col].fillna("").astype(str).map(_clean_style_key)
 
     def _make_tags(r):
         tags = []
@@ -802,8 +869,8 @@ def run_transform(
     sup["_tags"] = sup.apply(_make_tags, axis=1)
 
     # SKU
-    sup["_external_id"] = sup[extid_col].astype(str).fillna("").map(_norm) if extid_col else ""
-    sup["_product_code"] = sup[product_col].astype(str).fillna("").map(_norm) if product_col else ""
+    sup["_external_id"] = sup[extid_col].fillna("").astype(str).map(_norm) if extid_col else ""
+    sup["_product_code"] = sup[product_col].fillna("").astype(str).map(_norm) if product_col else ""
 
     def _make_sku(r):
         if r["_external_id"]:
@@ -816,31 +883,40 @@ def run_transform(
     sup["_variant_sku"] = sup.apply(_make_sku, axis=1)
 
     # Barcode
-    sup["_barcode"] = sup[upc_col].apply(_barcode_keep_zeros) if upc_col else ""
+    sup["_barcode"] = _barcode_keep_zeros_series(sup[upc_col]) if upc_col else ""
 
     # Country (standardize)
-    sup["_origin_raw"] = sup[origin_col].astype(str).fillna("").map(_norm) if origin_col else ""
-    sup["_origin_std"] = sup["_origin_raw"].apply(lambda x: _standardize(x, country_map))
+    sup["_origin_raw"] = sup[origin_col].fillna("").astype(str).map(_norm) if origin_col else ""
+    sup["_origin_std"] = _standardize_col(sup["_origin_raw"], country_map)
 
     # HS Code
-    sup["_hs"] = sup[hs_col].apply(_hs_code_clean) if hs_col else ""
+    sup["_hs"] = _hs_code_clean_series(sup[hs_col]) if hs_col else ""
 
     # Grams
     if grams_col:
-        sup["_grams"] = sup[grams_col].astype(str).fillna("").map(_norm)
+        sup["_grams"] = sup[grams_col].fillna("").astype(str).map(_norm)
     else:
         # Fallback: use Help Data -> "Variant Weight (Grams)" mapped by Custom Product Type
         sup["_grams"] = sup["_product_type"].apply(lambda pt: variant_weight_map.get(str(pt).strip().lower(), "") if pt else "")
 
     # Price
-    msrp_num = pd.to_numeric(
-        sup[msrp_col].astype(str).str.replace("$", "", regex=False).str.replace(",", "", regex=False),
+    p = pd.to_numeric(
+        sup[msrp_col].astype(str).str.replace(r"[$,]", "", regex=True),
         errors="coerce",
-    )
-    sup["_price"] = msrp_num.apply(_round_to_nearest_9_99)
+    ).to_numpy(dtype=np.float64, na_value=np.nan)
+    # Nearest 10 minus 0.01, computed in place on one buffer.
+    # Half-up on purpose: np.rint rounds halves to even (45 -> 39.99 instead of 49.99).
+    # NaN (unparseable MSRP) propagates through every step and stays empty.
+    price = p / 10.0
+    price += 0.5
+    np.floor(price, out=price)
+    price *= 10.0
+    price -= 0.01
+    np.round(price, 2, out=price)
+    sup["_price"] = price
 
     # Cost
-    sup["_cost"] = sup[landed_col].astype(str).fillna("").map(_norm) if landed_col else ""
+    sup["_cost"] = sup[landed_col].fillna("").astype(str).map(_norm) if landed_col else ""
 
     # Size comment
     def _size_comment(r):
@@ -850,11 +926,12 @@ def run_transform(
     sup["_size_comment"] = sup.apply(_size_comment, axis=1)
 
     # Categories: match using DESCRIPTION (to catch LONG SLEEVE, TEE → tshirt)
-    sup["_shopify_cat_id"] = sup["_desc_raw"].apply(lambda t: _best_match_id(t, shopify_cat_rows))
-    sup["_google_cat_id"] = sup["_desc_raw"].apply(lambda t: _best_match_id(t, google_cat_rows))
+    sup["_shopify_cat_id"] = [_best_match_id(w, shopify_cat_index) for w in desc_words]
+    sup["_google_cat_id"] = [_best_match_id(w, google_cat_index) for w in desc_words]
 
     # Siblings
-    sup["_siblings"] = sup.apply(lambda r: slugify(f"{r['_vendor']} {r['_desc_handle']}"), axis=1)
+    siblings_src = vendor_name + " " + sup["_desc_handle"]
+    sup["_siblings"] = [_slug(t) for t in siblings_src.to_numpy()]
 
     # SEO Title (adds 's for Men/Women, Title Case)
     def _seo_title(r):
@@ -892,68 +969,70 @@ def run_transform(
     # ---------------------------------------------------------
     # Build output (strict order)
     # ---------------------------------------------------------
-    out = pd.DataFrame(columns=SHOPIFY_OUTPUT_COLUMNS)
-
-    out["Handle"] = sup["_handle"]
-    out["Command"] = "NEW"
-    out["Title"] = sup["_title"]
-    out["Body (HTML)"] = ""
-    out["Vendor"] = sup["_vendor"]
-    out["Custom Product Type"] = sup["_product_type"]
-    out["Tags"] = sup["_tags"]
-
-    out["Published"] = False
-    out["Published Scope"] = "global"
-
-    out["Option1 Name"] = "Size"
-    out["Option1 Value"] = sup["_size_std"]
-
-    out["Variant SKU"] = sup["_variant_sku"]
-    out["Variant Barcode"] = sup["_barcode"]
-    out["Variant Country of Origin"] = sup["_origin_std"]
-    out["Variant HS Code"] = sup["_hs"]
-    out["Variant Grams"] = sup["_grams"]
-
-    out["Variant Inventory Tracker"] = "shopify"
-    out["Variant Inventory Policy"] = "deny"
-    out["Variant Fulfillment Service"] = "manual"
-    out["Variant Price"] = sup["_price"]
-
-    out["Variant Requires Shipping"] = True
-    out["Variant Taxable"] = True
-
-    out["SEO Title"] = sup["_seo_title"]
-    out["SEO Description"] = sup["_seo_desc"]
-
-    out["Variant Weight Unit"] = "g"
-    out["Cost per item"] = sup["_cost"]
-    out["Status"] = "draft"
-
-    out["Metafield: my_fields.product_use_case [multi_line_text_field]"] = ""
-    out["Metafield: my_fields.product_features [multi_line_text_field]"] = ""
-    out["Metafield: my_fields.behind_the_brand [multi_line_text_field]"] = sup["_behind_the_brand"]
-    out["Metafield: my_fields.size_comment [single_line_text_field]"] = sup["_size_comment"]
-    out["Metafield: my_fields.gender [single_line_text_field]"] = sup["_gender_std"]
-
-    out["Metafield: my_fields.colour [single_line_text_field]"] = sup["_color_std"]
-    out["Metafield: mm-google-shopping.color"] = sup["_color_std"]
-    out["Variant Metafield: mm-google-shopping.size"] = sup["_size_std"]
-
-    out["Metafield: mm-google-shopping.size_system"] = "US"
-    out["Metafield: mm-google-shopping.condition"] = "new"
-    out["Metafield: mm-google-shopping.google_product_category"] = sup["_google_cat_id"]
-    out["Metafield: mm-google-shopping.gender"] = sup["_gender_std"]
-
-    out["Variant Metafield: mm-google-shopping.mpn"] = sup["_variant_sku"]
-    out["Variant Metafield: mm-google-shopping.gtin"] = sup["_barcode"]
-
-    out["Metafield: theme.siblings [single_line_text_field]"] = sup["_siblings"]
-    out["Category: ID"] = sup["_shopify_cat_id"]
-
-    out["Inventory Available: Boutique"] = 0
-    out["Inventory Available: Le Club"] = 0
-
-    out = out.reindex(columns=SHOPIFY_OUTPUT_COLUMNS)
+    out = pd.DataFrame(
+        {
+            "Handle": sup["_handle"],
+            "Command": "NEW",
+            "Title": sup["_title"],
+            "Body (HTML)": "",
+            "Vendor": sup["_vendor"],
+            "Custom Product Type": sup["_product_type"],
+            "Tags": sup["_tags"],
+
+            "Published": False,
+            "Published Scope": "global",
+
+            "Option1 Name": "Size",
+            "Option1 Value": sup["_size_std"],
+
+            "Variant SKU": sup["_variant_sku"],
+            "Variant Barcode": sup["_barcode"],
+            "Variant Country of Origin": sup["_origin_std"],
+            "Variant HS Code": sup["_hs"],
+            "Variant Grams": sup["_grams"],
+
+            "Variant Inventory Tracker": "shopify",
+            "Variant Inventory Policy": "deny",
+            "Variant Fulfillment Service": "manual",
+            "Variant Price": sup["_price"],
+
+            "Variant Requires Shipping": True,
+            "Variant Taxable": True,
+
+            "SEO Title": sup["_seo_title"],
+            "SEO Description": sup["_seo_desc"],
+
+            "Variant Weight Unit": "g",
+            "Cost per item": sup["_cost"],
+            "Status": "draft",
+
+            "Metafield: my_fields.product_use_case [multi_line_text_field]": "",
+            "Metafield: my_fields.product_features [multi_line_text_field]": "",
+            "Metafield: my_fields.behind_the_brand [multi_line_text_field]": sup["_behind_the_brand"],
+            "Metafield: my_fields.size_comment [single_line_text_field]": sup["_size_comment"],
+            "Metafield: my_fields.gender [single_line_text_field]": sup["_gender_std"],
+
+            "Metafield: my_fields.colour [single_line_text_field]": sup["_color_std"],
+            "Metafield: mm-google-shopping.color": sup["_color_std"],
+            "Variant Metafield: mm-google-shopping.size": sup["_size_std"],
+
+            "Metafield: mm-google-shopping.size_system": "US",
+            "Metafield: mm-google-shopping.condition": "new",
+            "Metafield: mm-google-shopping.google_product_category": sup["_google_cat_id"],
+            "Metafield: mm-google-shopping.gender": sup["_gender_std"],
+
+            "Variant Metafield: mm-google-shopping.mpn": sup["_variant_sku"],
+            "Variant Metafield: mm-google-shopping.gtin": sup["_barcode"],
+
+            "Metafield: theme.siblings [single_line_text_field]": sup["_siblings"],
+            "Category: ID": sup["_shopify_cat_id"],
+
+            "Inventory Available: Boutique": 0,
+            "Inventory Available: Le Club": 0,
+        },
+        index=sup.index,
+        columns=SHOPIFY_OUTPUT_COLUMNS,
+    )
 
     # Yellow rules
     yellow_if_empty_cols = [
@@ -978,49 +1057,20 @@ def run_transform(
         "Category: ID",
     ]
 
-    def _apply_red_font_for_tags(buffer: io.BytesIO, sheet_name: str, rows_to_color_red: list[int]) -> io.BytesIO:
-        """Apply red font to the 'Tags' cell for given 0-based dataframe row indexes."""
-        buffer.seek(0)
-        wb = openpyxl.load_workbook(buffer)
-        if sheet_name not in wb.sheetnames:
-            return buffer
-        ws = wb[sheet_name]
-
-        # Find Tags column index from header row (row 1)
-        tags_col_idx = None
-        for c in range(1, ws.max_column + 1):
-            v = ws.cell(row=1, column=c).value
-            if str(v).strip() == "Tags":
-                tags_col_idx = c
-                break
-        if tags_col_idx is None:
-            return buffer
-
-        red_font = openpyxl.styles.Font(color="FFFF0000")
-
-        # Data rows start at Excel row 2
-        for df_i in rows_to_color_red:
-            excel_row = df_i + 2
-            cell = ws.cell(row=excel_row, column=tags_col_idx)
-            cell.font = red_font
-
-        out = io.BytesIO()
-        wb.save(out)
-        out.seek(0)
-        return out
+    # Red font for Tags when colour is NOT Black (i.e., Seasonal)
+    color_key = sup["_color_std"].astype(str).map(_norm).str.lower()
+    rows_to_color_red_cells = np.flatnonzero((color_key.ne("") & color_key.ne("black")).to_numpy())
 
+    # constant_memory: only the current row is kept in RAM; formats are applied while writing
     buffer = io.BytesIO()
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        out.to_excel(writer, index=False, sheet_name="shopify_import")
-        pd.DataFrame(warnings).to_excel(writer, index=False, sheet_name="warnings")
+    wb = xlsxwriter.Workbook(buffer, {"constant_memory": True, "strings_to_urls": False})
 
-    # Red font for Tags when colour is NOT Black (i.e., Seasonal)
-    rows_to_color_red_cells = [
-        i
-        for i, c in enumerate(sup["_color_std"].astype(str).tolist())
-        if _norm(c) != "" and _norm(c).lower() != "black"
-    ]
-    buffer = _apply_red_font_for_tags(buffer, "shopify_import", rows_to_color_red_cells)
+    cell_formats = np.full(out.shape, None, dtype=object)
+    cell_formats[rows_to_color_red_cells, out.columns.get_loc("Tags")] = wb.add_format(RED_FONT)
+    cell_formats[_empty_cells_mask(out, yellow_if_empty_cols)] = wb.add_format(YELLOW_FILL)
+
+    _write_sheet(wb, "shopify_import", out, cell_formats)
+    _write_sheet(wb, "warnings", pd.DataFrame(warnings))
+    wb.close()
 
-    buffer = _apply_yellow_for_empty(buffer, "shopify_import", yellow_if_empty_cols)
     return buffer.getvalue(), pd.DataFrame(warnings)